@@ -1,40 +1,257 @@
 
 import os
-import json
 import asyncio
+import hashlib
+import orjson
+import random
 import time
+import numpy as np
+from collections import OrderedDict
 from typing import List, Dict, Any
 from google import genai
 from google.genai import types
 from google.api_core import exceptions
+from pydantic import BaseModel, Field
 
 # Initialize Gemini Client
+# Hard timeout (ms) so a stalled request fails fast instead of hanging a worker.
 try:
-    client = genai.Client(api_key=os.environ.get("GOOGLE_API_KEY"))
+    client = genai.Client(
+        api_key=os.environ.get("GOOGLE_API_KEY"),
+        http_options=types.HttpOptions(timeout=20_000),
+    )
 except Exception as e:
     print(f"Warning: GOOGLE_API_KEY might be missing. {e}")
     client = None
 
+# Rough chars-per-token ratio for English prose; close enough for budgeting
+# prompts without a round-trip to the token-count API.
+_CHARS_PER_TOKEN = 4
+
+def _truncate_to_tokens(text: str, max_tokens: int = 2000) -> str:
+    """
+    Trims text to roughly max_tokens using a chars-per-token heuristic.
+    Keeps the head (contact info, most recent role) and the tail (education,
+    earliest experience) and drops the middle, which loses less signal than
+    hard-chopping the tail off a resume.
+    """
+    max_chars = max_tokens * _CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    head = text[: max_chars * 2 // 3]
+    tail = text[-(max_chars // 3):]
+    return head + "\n[... trimmed ...]\n" + tail
+
+def _max_cosine_similarity(chunk_embeddings, query_embedding) -> float:
+    """
+    Max cosine similarity between a query vector and a set of chunk vectors.
+    Pure numpy; cheap enough to run on every analysis as a pre-screen.
+    """
+    chunks = np.asarray(chunk_embeddings, dtype=np.float32)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    chunks = chunks / np.linalg.norm(chunks, axis=1, keepdims=True)
+    query = query / np.linalg.norm(query)
+    return float((chunks @ query).max())
+
+# Static half of the skill-extraction prompt. Sending it as a system
+# instruction keeps the per-call contents down to the JD text alone, and
+# lets provider-side prefix caching reuse the instruction across calls.
+_EXTRACT_SYSTEM_INSTRUCTION = """
+Analyze the Job Description provided by the user and extract the key skills required.
+Return ONLY a JSON object with two keys: "hard_skills" (list of strings) and "soft_skills" (list of strings).
+Do not include any markdown formatting or explanations.
+"""
+
+# Invariant rubric + output schema for the final report. Kept out of the
+# per-request prompt so it can live in a server-side cached system
+# instruction and only the variable resume/JD context travels per call.
+_REPORT_SYSTEM_INSTRUCTION = """
+You are a panel of strict, expert recruiters reviewing a resume against a job description.
+The user has already verified the candidate's skills using semantic search over the resume.
+You must (a) evaluate the resume against specific heuristics and 'pet peeves' collected from top recruiters, and (b) synthesize the final evaluation report.
+
+EVALUATION CRITERIA:
+
+1. **Basics & Formatting**:
+   - **Email**: Must be professional (gmail/outlook/domain). NO HOTMAIL.
+   - **Length**: Should be 1 page unless experience > 20 years.
+   - **Address**: "City, State" only. No full addresses.
+   - **Filename**: Should be "FirstName LastName Resume". No "Version 1", "Final", or role names in title.
+   - **Objective/Summary**: Should NOT exist.
+   - **Layout**: Single column preference (hard to tell from text, but infer if reading order seems jumping).
+
+2. **Content Style**:
+   - **Tone**: Plain, direct style. No fluff/thesaurus words.
+   - **Quantifiable**: Achievements must have numbers/metrics.
+   - **Methodology**: Explain HOW success was achieved, not just what.
+
+3. **The 7-Point Tick List** (Rate these as TRUE/FALSE based on evidence):
+   - Job Title Match (Are titles clear/standard?)
+   - Industry Match (Is industry experience obvious?)
+   - Product Knowledge (Specific products/tools mentioned?)
+   - Specialist Technical (Deep technical skills?)
+   - Relevant Qualifications (Degrees/Certs visible?)
+   - Ability to Add Value (Clear wins/revenue/growth?)
+   - No. Years Experience (Easy to find total years?)
+
+TASK:
+Generate a structured JSON report evaluating the candidate.
+The JSON must have this exact structure:
+{
+    "match_score": <integer_0_to_100>,
+    "analysis": {
+        "strong_matches": [<list of matching skills with brief evidence>],
+        "missing_skills": [<list of missing skills with recommendations>]
+    },
+    "recruiter_feedback": {
+        "tick_list": {
+             // The 7-Point Tick List results. Keys must match exactly:
+             "Job Title Match": boolean,
+             "Industry Match": boolean,
+             "Product Knowledge": boolean,
+             "Specialist Technical": boolean,
+             "Relevant Qualifications": boolean,
+             "Ability to Add Value": boolean,
+             "Years Experience": boolean
+        },
+        "red_flags": [
+            // List of strings. Only include if a heuristic rule is VIOLATED.
+            // Examples: "Filename 'resume_final_v2.pdf' is unprofessional. Rename to 'First Last Resume'.",
+            // "Found a Hotmail address. Use Gmail or Outlook.",
+            // "Resume is 3 pages long. condense to 1 page.",
+            // "Found an 'Objective' section. Delete it and save space."
+        ],
+        "style_critique": [
+            // List of strings. Critiques on writing style, lack of metrics, etc.
+            // Example: "Bullet points under 'Software Engineer' lack quantifiable metrics."
+        ]
+    },
+    "interview_prep": [<list of 3 tough interview questions based on the gaps or weak matches>]
+}
+
+Be fair but strict.
+If 'red_flags' has many items, lower the match_score significantly (e.g. -5 points per red flag).
+Return ONLY valid JSON.
+"""
+
+# Response schema for the report call. Passing this as response_schema makes
+# the model decode schema-constrained JSON, so malformed output (and the
+# retry it would force) can't happen; aliases preserve the spaced tick-list
+# keys the renderers already expect.
+class _SkillMatch(BaseModel):
+    skill: str
+    evidence: str = ""
+
+class _SkillGap(BaseModel):
+    skill: str
+    recommendation: str = ""
+
+class _SkillAnalysis(BaseModel):
+    strong_matches: List[_SkillMatch]
+    missing_skills: List[_SkillGap]
+
+class _TickList(BaseModel):
+    job_title_match: bool = Field(alias="Job Title Match")
+    industry_match: bool = Field(alias="Industry Match")
+    product_knowledge: bool = Field(alias="Product Knowledge")
+    specialist_technical: bool = Field(alias="Specialist Technical")
+    relevant_qualifications: bool = Field(alias="Relevant Qualifications")
+    ability_to_add_value: bool = Field(alias="Ability to Add Value")
+    years_experience: bool = Field(alias="Years Experience")
+
+class _RecruiterFeedback(BaseModel):
+    tick_list: _TickList
+    red_flags: List[str]
+    style_critique: List[str]
+
+class _Report(BaseModel):
+    match_score: int
+    analysis: _SkillAnalysis
+    recruiter_feedback: _RecruiterFeedback
+    interview_prep: List[str]
+
 class ResumeAnalyzer:
+    # Keep a bounded number of full reports around; each entry is tiny JSON
+    # but we don't want an unbounded dict on a long-lived server process.
+    CACHE_MAX_ENTRIES = 128
+    # Users iterate on resume drafts against the same JD, so the JD-side
+    # extraction gets its own (larger) cache independent of the resume.
+    JD_CACHE_MAX_ENTRIES = 256
+    # Cap in-flight API calls below the Gemini free-tier QPM so we throttle
+    # ourselves instead of burning quota on 429s and retries.
+    MAX_CONCURRENT_CALLS = 8
+    # Cosine distance above which a nearest neighbour is treated as noise
+    # rather than evidence (n_results=1 always returns *something*).
+    MATCH_DISTANCE_THRESHOLD = 0.35
+    # How long the server-side cached report rubric lives
+    REPORT_CACHE_TTL_SECONDS = 3600
+    # Max cosine similarity between the JD and any resume chunk below which
+    # the resume is treated as an obvious non-match: we still extract and
+    # verify skills (so the gaps are named), but skip the full report call.
+    PRESCREEN_SIM_THRESHOLD = 0.25
+
     def __init__(self, vector_store):
         self.vector_store = vector_store
+        self._sem = asyncio.Semaphore(self.MAX_CONCURRENT_CALLS)
+        # Full-report cache keyed by sha256(resume_text):sha256(job_description).
+        # A repeat submission of the same PDF + JD skips every Gemini call.
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        # Extracted skills keyed by sha256(job_description); LRU-evicted.
+        self._jd_cache: "OrderedDict[str, Dict[str, List[str]]]" = OrderedDict()
+        # Name (and creation time) of the server-side cached report rubric;
+        # "" means creation failed and we send the rubric inline instead.
+        self._report_cache_name = None
+        self._report_cache_created = 0.0
+
+    def _get_report_cache_name(self) -> str:
+        """
+        Creates (once per TTL) a server-side cached content holding the
+        invariant report rubric, so every report call only sends the
+        variable resume/JD context over the wire. Returns "" when context
+        caching is unavailable, in which case the rubric is sent inline.
+        """
+        # Recreate a bit before the server-side TTL actually expires
+        expired = (time.time() - self._report_cache_created) > (self.REPORT_CACHE_TTL_SECONDS - 300)
+        if self._report_cache_name is None or (self._report_cache_name and expired):
+            try:
+                cache = client.caches.create(
+                    model="gemini-2.5-flash",
+                    config=types.CreateCachedContentConfig(
+                        system_instruction=_REPORT_SYSTEM_INSTRUCTION,
+                        ttl=f"{self.REPORT_CACHE_TTL_SECONDS}s",
+                    ),
+                )
+                self._report_cache_name = cache.name
+                self._report_cache_created = time.time()
+            except Exception as e:
+                print(f"Warning: prompt caching unavailable, sending rubric inline. {e}")
+                self._report_cache_name = ""
+        return self._report_cache_name
 
     async def _call_gemini_with_retry(self, func, *args, **kwargs):
         """
         Helper to call Gemini API with exponential backoff.
         """
         max_retries = 3
-        delay = 2  # Start with 2 seconds
-        
+
         for attempt in range(max_retries + 1):
             try:
-                return await func(*args, **kwargs) if asyncio.iscoroutinefunction(func) else func(*args, **kwargs)
+                # The semaphore throttles total in-flight calls across all tasks
+                async with self._sem:
+                    if asyncio.iscoroutinefunction(func):
+                        return await func(*args, **kwargs)
+                    # Sync funcs (e.g. vector store queries) would block the event
+                    # loop, so push them onto the default thread pool instead.
+                    loop = asyncio.get_running_loop()
+                    return await loop.run_in_executor(None, lambda: func(*args, **kwargs))
             except (exceptions.ResourceExhausted, exceptions.ServiceUnavailable) as e:
                 if attempt == max_retries:
                     raise e
-                print(f"API Error ({type(e).__name__}). Retrying in {delay} seconds... (Attempt {attempt+1}/{max_retries})")
-                time.sleep(delay)
-                delay *= 2 # Exponential backoff
+                # Exponential backoff with jitter so concurrent tasks that hit
+                # a 429 together don't all wake up and retry at the same moment.
+                delay = min(60, (2 ** (attempt + 1)) + random.uniform(0, 1))
+                print(f"API Error ({type(e).__name__}). Retrying in {delay:.1f} seconds... (Attempt {attempt+1}/{max_retries})")
+                await asyncio.sleep(delay)
             except Exception as e:
                 # For other errors, re-raise immediately
                 raise e
@@ -47,239 +264,356 @@ class ResumeAnalyzer:
         if not client:
              raise ValueError("Gemini Client not initialized.")
 
-        prompt = f"""
-        Analyze the following Job Description and extract the key skills required.
-        Return ONLY a JSON object with two keys: "hard_skills" (list of strings) and "soft_skills" (list of strings).
-        Do not include any markdown formatting or explanations.
-
-        Job Description:
-        {job_description}
-        """
+        # Same JD while iterating on resume drafts -> pay the extraction once
+        jd_key = hashlib.sha256(job_description.encode()).hexdigest()
+        if jd_key in self._jd_cache:
+            self._jd_cache.move_to_end(jd_key)
+            return self._jd_cache[jd_key]
 
         try:
             response = await self._call_gemini_with_retry(
                 client.models.generate_content,
                 model="gemini-2.5-flash",
-                contents=prompt,
+                # Only the JD travels as contents; the invariant instruction
+                # rides along as a (prefix-cacheable) system instruction.
+                contents=f"Job Description:\n{job_description}",
                 config=types.GenerateContentConfig(
+                    system_instruction=_EXTRACT_SYSTEM_INSTRUCTION,
                     response_mime_type="application/json",
+                    # Small JSON of skill names; keep the decode budget tight
+                    max_output_tokens=512,
+                    temperature=0.2,
+                    candidate_count=1,
                 ),
             )
-            return json.loads(response.text)
+            extracted = orjson.loads(response.text)
+            if len(self._jd_cache) >= self.JD_CACHE_MAX_ENTRIES:
+                self._jd_cache.popitem(last=False)
+            self._jd_cache[jd_key] = extracted
+            return extracted
         except Exception as e:
             print(f"Error extracting skills: {e}")
             return {"hard_skills": [], "soft_skills": []}
 
-    async def verify_skills(self, skills: List[str], collection) -> List[Dict[str, Any]]:
+    async def verify_skills(self, skills: List[str], collection, embeddings=None) -> List[Dict[str, Any]]:
         """
         For each skill, query the vector store for evidence.
+        Pre-computed skill embeddings can be passed to skip re-embedding.
         """
-        results = []
-        for skill in skills:
-            # Create a simple verification report for each skill
-            # We query for the top 1 match to see if there is close evidence
-            
-            try:
-                # We also wrap embedding calls in retry as they also have limits (though different quota)
-                matches = await self._call_gemini_with_retry(
-                    self.vector_store.query_similar,
-                    collection, 
-                    skill, 
-                    n_results=1
-                )
-            except Exception as e:
-                print(f"Error checking skill {skill}: {e}")
-                matches = []
-
-            match_found = False
-            evidence_text = ""
-            
-            if matches:
-                evidence_text = matches[0]
-                match_found = True # We assume semantic search found something relevant
-            
-            results.append({
-                "skill": skill,
-                "found": match_found,
-                "evidence": evidence_text
-            })
-        return results
-
-    async def analyze_recruiter_heuristics(self, resume_text: str, file_metadata: Dict[str, Any]) -> Dict[str, Any]:
+        if not skills:
+            return []
+
+        # Batch all skills into a single query so the embedding round-trip
+        # is paid once for the whole list instead of once per skill.
+        try:
+            # We also wrap embedding calls in retry as they also have limits (though different quota)
+            matches_per_skill, distances_per_skill = await self._call_gemini_with_retry(
+                self.vector_store.query_similar_batch,
+                collection,
+                skills,
+                n_results=1,
+                query_embeddings=embeddings
+            )
+        except Exception as e:
+            print(f"Error checking skills {skills}: {e}")
+            matches_per_skill = [[] for _ in skills]
+            distances_per_skill = [[] for _ in skills]
+
+        # Only treat the nearest chunk as evidence when it's actually
+        # close; a distant neighbour is noise, not a match.
+        threshold = self.MATCH_DISTANCE_THRESHOLD
+        found_flags = [
+            bool(matches) and bool(distances) and distances[0] < threshold
+            for matches, distances in zip(matches_per_skill, distances_per_skill)
+        ]
+
+        # The batched query gives us everything up front, so assemble the
+        # result list with a zip comprehension instead of per-skill appends.
+        return [
+            {"skill": skill, "found": found, "evidence": matches[0] if found else ""}
+            for skill, matches, found in zip(skills, matches_per_skill, found_flags)
+        ]
+
+    async def _build_report_request(self, job_description: str, hard_skills_analysis: List[Dict], soft_skills_analysis: List[Dict], resume_text: str, file_metadata: Dict[str, Any]):
+        """
+        Assembles the (prompt, config) pair shared by the buffered and
+        streaming report calls.
+        """
+        # Prepare context for the synthesis agent. Matched skills carry their
+        # evidence chunk; unmatched skills go in as bare names so false-positive
+        # noise doesn't bloat the prompt.
+        def split_verified(verified: List[Dict]) -> Dict[str, Any]:
+            return {
+                "matched": [{"skill": s["skill"], "evidence": s["evidence"]} for s in verified if s.get("found")],
+                "no_evidence_found": [s["skill"] for s in verified if not s.get("found")]
+            }
+
+        analysis_context = {
+            "hard_skills": split_verified(hard_skills_analysis),
+            "soft_skills": split_verified(soft_skills_analysis)
+        }
+
+        # Slicing a large resume and serializing the context are CPU work;
+        # run them off the loop so in-flight API awaits keep progressing.
+        resume_excerpt, context_json = await asyncio.gather(
+            asyncio.to_thread(_truncate_to_tokens, resume_text),
+            asyncio.to_thread(lambda: orjson.dumps(analysis_context).decode()),
+        )
+
+        # Only the variable part of the prompt; the rubric travels via the
+        # cached system instruction (or inline if caching is unavailable).
+        prompt = f"""
+        Resume Text (trimmed to ~2000 tokens, middle dropped if over):
+        {resume_excerpt}
+
+        Metadata:
+        Filename: {file_metadata.get('filename', 'Unknown')}
+        Page Count: {file_metadata.get('page_count', 1)}
+
+        Skill verification data (from semantic search):
+        {context_json}
+
+        Job Description Summary:
+        {job_description[:500]}... (truncated)
+        """
+
+        config_kwargs = {
+            "response_mime_type": "application/json",
+            "response_schema": _Report,
+            "max_output_tokens": 2048,
+            "temperature": 0.2,
+            "candidate_count": 1,
+        }
+        cache_name = self._get_report_cache_name()
+        if cache_name:
+            config_kwargs["cached_content"] = cache_name
+        else:
+            config_kwargs["system_instruction"] = _REPORT_SYSTEM_INSTRUCTION
+
+        return prompt, types.GenerateContentConfig(**config_kwargs)
+
+    async def generate_report(self, job_description: str, hard_skills_analysis: List[Dict], soft_skills_analysis: List[Dict], resume_text: str, file_metadata: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Analyzes the resume based on the "4 Persona" interview feedback (heuristics).
-        
-        Feedback Summary:
+        Runs the recruiter heuristics check AND synthesizes the final report
+        in a single Gemini call.
+
+        The heuristics are based on the "4 Persona" interview feedback:
         1. Professional Email (no hotmail), No objective/summary, 1 page (<20y exp), Simple address, Filename format, PDF.
         2. 7 Point Tick List: Job Title, Industry, Product, Technical, Qualifications, Value Add, Exp Years.
         3. Single column, Black & White.
         4. Plain/Direct writing, quantifiable achievements, no fancy fonts.
+
+        They used to live in a separate call, but the synthesis step only
+        reformats data it already has, so fusing them saves a full LLM
+        round-trip per analysis.
         """
         if not client:
              raise ValueError("Gemini Client not initialized.")
-             
-        prompt = f"""
-        You are a panel of strict, expert recruiters reviewing a resume. 
-        You need to evaluate this resume based on specific heuristics and 'pet peeves' collected from top recruiters.
-        
-        Resume Text (First 3000 chars approx): 
-        {resume_text[:3000]}...
-        
-        Metadata:
-        Filename: {file_metadata.get('filename', 'Unknown')}
-        Page Count: {file_metadata.get('page_count', 1)}
-        
-        EVALUATION CRITERIA:
-        
-        1. **Basics & Formatting**:
-           - **Email**: Must be professional (gmail/outlook/domain). NO HOTMAIL.
-           - **Length**: Should be 1 page unless experience > 20 years.
-           - **Address**: "City, State" only. No full addresses.
-           - **Filename**: Should be "FirstName LastName Resume". No "Version 1", "Final", or role names in title.
-           - **Objective/Summary**: Should NOT exist.
-           - **Layout**: Single column preference (hard to tell from text, but infer if reading order seems jumping).
-        
-        2. **Content Style**:
-           - **Tone**: Plain, direct style. No fluff/thesaurus words.
-           - **Quantifiable**: Achievements must have numbers/metrics.
-           - **Methodology**: Explain HOW success was achieved, not just what.
-        
-        3. **The 7-Point Tick List** (Rate these as TRUE/FALSE based on evidence):
-           - Job Title Match (Are titles clear/standard?)
-           - Industry Match (Is industry experience obvious?)
-           - Product Knowledge (Specific products/tools mentioned?)
-           - Specialist Technical (Deep technical skills?)
-           - Relevant Qualifications (Degrees/Certs visible?)
-           - Ability to Add Value (Clear wins/revenue/growth?)
-           - No. Years Experience (Easy to find total years?)
-
-        TASK:
-        Generate a JSON report with this EXACT structure:
-        {{
-            "seven_point_summary": {{
-                "job_title_match": boolean,
-                "industry_match": boolean,
-                "product_knowledge": boolean,
-                "specialist_technical": boolean,
-                "relevant_qualifications": boolean,
-                "ability_to_add_value": boolean,
-                "years_experience_visible": boolean
-            }},
-            "heuristic_warnings": [
-                // List of strings. Only include if a rule is VIOLATED.
-                // Examples: "Filename 'resume_final_v2.pdf' is unprofessional. Rename to 'First Last Resume'.",
-                // "Found a Hotmail address. Use Gmail or Outlook.",
-                // "Resume is 3 pages long. condense to 1 page.",
-                // "Found an 'Objective' section. Delete it and save space."
-            ],
-            "content_critique": [
-                // List of strings. Critiques on writing style, lack of metrics, etc.
-                // Example: "Bullet points under 'Software Engineer' lack quantifiable metrics."
-            ]
-        }}
-        
-        Return ONLY valid JSON.
-        """
+
+        prompt, config = await self._build_report_request(
+            job_description, hard_skills_analysis, soft_skills_analysis, resume_text, file_metadata
+        )
 
         try:
             response = await self._call_gemini_with_retry(
                 client.models.generate_content,
                 model="gemini-2.5-flash",
                 contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                ),
+                config=config,
             )
-            return json.loads(response.text)
+            # Schema-constrained decode: the SDK hands back the validated
+            # model directly. Fall back to parsing the text once if the
+            # parsed form is missing rather than retrying the call.
+            if response.parsed is not None:
+                return response.parsed.model_dump(by_alias=True)
+            return orjson.loads(response.text)
         except Exception as e:
-            print(f"Error in recruiter heuristics: {e}")
-            return {"seven_point_summary": {}, "heuristic_warnings": [], "content_critique": []}
+            print(f"Error generating report: {e}")
+            raise e # Raise so main.py handles it
 
-    async def generate_report(self, job_description: str, hard_skills_analysis: List[Dict], soft_skills_analysis: List[Dict], recruiter_analysis: Dict) -> Dict[str, Any]:
+    async def generate_report_stream(self, job_description: str, hard_skills_analysis: List[Dict], soft_skills_analysis: List[Dict], resume_text: str, file_metadata: Dict[str, Any]):
         """
-        Synthesizes the final report using Gemini.
+        Streaming variant of generate_report: yields the report's JSON text
+        chunk by chunk as Gemini produces it, so callers can start rendering
+        at first-token latency instead of waiting for the full decode.
         """
         if not client:
              raise ValueError("Gemini Client not initialized.")
 
-        # Prepare context for the synthesis agent
-        analysis_context = {
-            "hard_skills": hard_skills_analysis,
-            "soft_skills": soft_skills_analysis,
-            "recruiter_heuristics": recruiter_analysis
+        prompt, config = await self._build_report_request(
+            job_description, hard_skills_analysis, soft_skills_analysis, resume_text, file_metadata
+        )
+
+        # Hold the shared semaphore for the whole stream so streaming calls
+        # count against the same in-flight cap as everything routed through
+        # _call_gemini_with_retry. Stream initiation is retried with the same
+        # backoff; once the first chunk has been yielded a failure can't be
+        # retried transparently, so mid-stream errors propagate.
+        max_retries = 3
+        async with self._sem:
+            for attempt in range(max_retries + 1):
+                try:
+                    stream = await client.aio.models.generate_content_stream(
+                        model="gemini-2.5-flash",
+                        contents=prompt,
+                        config=config,
+                    )
+                    break
+                except (exceptions.ResourceExhausted, exceptions.ServiceUnavailable) as e:
+                    if attempt == max_retries:
+                        raise e
+                    delay = min(60, (2 ** (attempt + 1)) + random.uniform(0, 1))
+                    print(f"API Error ({type(e).__name__}). Retrying in {delay:.1f} seconds... (Attempt {attempt+1}/{max_retries})")
+                    await asyncio.sleep(delay)
+            async for chunk in stream:
+                if chunk.text:
+                    yield chunk.text
+
+    async def _cache_key(self, resume_text_full: str, job_description: str) -> str:
+        # Hashing a multi-MB resume text is CPU-bound, so keep it off the loop
+        return await asyncio.to_thread(
+            lambda: hashlib.sha256(resume_text_full.encode()).hexdigest()
+            + ":" +
+            hashlib.sha256(job_description.encode()).hexdigest()
+        )
+
+    def _cache_store(self, cache_key: str, final_report: Dict[str, Any]):
+        # Store for repeat submissions, evicting the oldest entry when full
+        if len(self._cache) >= self.CACHE_MAX_ENTRIES:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[cache_key] = final_report
+
+    async def _extract_and_verify(self, job_description: str, collection):
+        """
+        Shared front half of the pipeline: extract JD skills, batch-embed
+        them, and verify both lists against the resume collection.
+        """
+        # 1. Extract Skills (feeds verification, so it must come first).
+        # The report rubric cache is warmed concurrently: its creation
+        # round-trip hides behind the extraction call instead of delaying
+        # the report later.
+        extracted, _ = await asyncio.gather(
+            self.extract_skills(job_description),
+            asyncio.to_thread(self._get_report_cache_name),
+        )
+
+        # 2. Embed all skills in one batched call instead of one embedding
+        # round-trip per query, then verify both lists against the collection.
+        hard_skills = extracted.get("hard_skills", [])
+        soft_skills = extracted.get("soft_skills", [])
+        all_skills = hard_skills + soft_skills
+
+        skill_embeddings = None
+        if all_skills:
+            try:
+                # Goes through the persistent embedding cache, so common
+                # skills that appeared in earlier JDs cost nothing.
+                skill_embeddings = await self._call_gemini_with_retry(
+                    self.vector_store.embed_texts,
+                    all_skills,
+                )
+            except Exception as e:
+                # Fall back to letting the collection embed the query texts
+                print(f"Error batch-embedding skills: {e}")
+
+        hard_emb = skill_embeddings[:len(hard_skills)] if skill_embeddings else None
+        soft_emb = skill_embeddings[len(hard_skills):] if skill_embeddings else None
+
+        # 3. Verify Skills (hard and soft share no data, so overlap their round-trips)
+        return await asyncio.gather(
+            self.verify_skills(hard_skills, collection, embeddings=hard_emb),
+            self.verify_skills(soft_skills, collection, embeddings=soft_emb)
+        )
+
+    def _low_match_report(self, similarity: float, hard_skills_verified: List[Dict], soft_skills_verified: List[Dict]) -> Dict[str, Any]:
+        """
+        Cheap report for resumes the pre-screen rejected: names the matched
+        and missing skills without spending a synthesis call on a resume
+        that clearly targets a different role.
+        """
+        verified = hard_skills_verified + soft_skills_verified
+        return {
+            "match_score": max(0, int(similarity * 100)),
+            "analysis": {
+                "strong_matches": [s["skill"] for s in verified if s.get("found")],
+                "missing_skills": [s["skill"] for s in verified if not s.get("found")],
+            },
+            "recruiter_feedback": {
+                "tick_list": {},
+                "red_flags": [
+                    "Resume content barely overlaps this job description. "
+                    "It reads as targeting a different role; tailor it before applying."
+                ],
+                "style_critique": [],
+            },
+            "interview_prep": [],
         }
-        
-        prompt = f"""
-        You are an expert technical recruiter. I have analyzed a candidate's resume against a job description using semantic search AND a strict recruiter heuristics check.
-        
-        Here is the raw analysis data:
-        {json.dumps(analysis_context, indent=2)}
 
-        Job Description Summary:
-        {job_description[:500]}... (truncated)
+    async def analyze(self, job_description: str, collection, resume_text_full: str, file_metadata: Dict[str, Any], on_section=None, chunk_embeddings=None) -> Dict[str, Any]:
+        # 0. Cache check: identical resume + JD means an identical report,
+        # so short-circuit before paying for any LLM/embedding calls.
+        cache_key = await self._cache_key(resume_text_full, job_description)
+        if cache_key in self._cache:
+            return self._cache[cache_key]
+
+        # 0b. Pre-screen when the caller has the resume's chunk vectors in
+        # hand: one JD embedding (usually a cache hit on re-runs) and a
+        # numpy dot product decide whether the full report call is worth it.
+        similarity = None
+        if chunk_embeddings is not None and len(chunk_embeddings) > 0:
+            try:
+                jd_embedding = (await self._call_gemini_with_retry(
+                    self.vector_store.embed_texts, [job_description]
+                ))[0]
+                similarity = _max_cosine_similarity(chunk_embeddings, jd_embedding)
+            except Exception as e:
+                # The pre-screen is an optimization; never let it kill a run
+                print(f"Warning: similarity pre-screen failed: {e}")
+
+        hard_skills_verified, soft_skills_verified = await self._extract_and_verify(job_description, collection)
 
-        Task:
-        Generate a structured JSON report evaluating the candidate.
-        The JSON must have this exact structure:
-        {{
-            "match_score": <integer_0_to_100>,
-            "analysis": {{
-                "strong_matches": [<list of matching skills with brief evidence>],
-                "missing_skills": [<list of missing skills with recommendations>]
-            }},
-            "recruiter_feedback": {{
-                "tick_list": {{
-                     // Copy directly from recruiter_heuristics.seven_point_summary, but ensure keys match exactly
-                     "Job Title Match": boolean,
-                     "Industry Match": boolean,
-                     "Product Knowledge": boolean,
-                     "Specialist Technical": boolean,
-                     "Relevant Qualifications": boolean,
-                     "Ability to Add Value": boolean,
-                     "Years Experience": boolean
-                }},
-                "red_flags": [<list of string warnings from heuristic_warnings>],
-                "style_critique": [<list of string critiques from content_critique>]
-            }},
-            "interview_prep": [<list of 3 tough interview questions based on the gaps or weak matches>]
-        }}
-        
-        Be fair but strict. 
-        If 'red_flags' has many items, lower the match_score significantly (e.g. -5 points per red flag).
-        Return ONLY valid JSON.
+        if similarity is not None and similarity < self.PRESCREEN_SIM_THRESHOLD:
+            final_report = self._low_match_report(similarity, hard_skills_verified, soft_skills_verified)
+            if on_section:
+                on_section("verified_skills", {"hard": hard_skills_verified, "soft": soft_skills_verified})
+            self._cache_store(cache_key, final_report)
+            return final_report
+
+        # Let UIs surface intermediate results instead of a blank spinner
+        # for the whole pipeline
+        if on_section:
+            on_section("verified_skills", {"hard": hard_skills_verified, "soft": soft_skills_verified})
+
+        # 4. Generate Report (recruiter heuristics are fused into this call)
+        final_report = await self.generate_report(job_description, hard_skills_verified, soft_skills_verified, resume_text_full, file_metadata)
+
+        self._cache_store(cache_key, final_report)
+
+        return final_report
+
+    async def analyze_stream(self, job_description: str, collection, resume_text_full: str, file_metadata: Dict[str, Any]):
+        """
+        Streaming variant of analyze(): yields the final report's JSON text
+        as it is generated. The assembled report is parsed at the end and
+        fed into the same result cache as the buffered path.
         """
+        cache_key = await self._cache_key(resume_text_full, job_description)
+        if cache_key in self._cache:
+            yield orjson.dumps(self._cache[cache_key]).decode()
+            return
+
+        hard_skills_verified, soft_skills_verified = await self._extract_and_verify(job_description, collection)
+
+        parts = []
+        async for chunk in self.generate_report_stream(job_description, hard_skills_verified, soft_skills_verified, resume_text_full, file_metadata):
+            parts.append(chunk)
+            yield chunk
 
         try:
-            response = await self._call_gemini_with_retry(
-                client.models.generate_content,
-                model="gemini-2.5-flash",
-                contents=prompt,
-                config=types.GenerateContentConfig(
-                    response_mime_type="application/json",
-                ),
-            )
-            return json.loads(response.text)
+            self._cache_store(cache_key, orjson.loads("".join(parts)))
         except Exception as e:
-            print(f"Error generating report: {e}")
-            raise e # Raise so main.py handles it
-
-    async def analyze(self, job_description: str, collection, resume_text_full: str, file_metadata: Dict[str, Any]) -> Dict[str, Any]:
-        # 1. Extract Skills (Parallelizable)
-        extracted_task = self.extract_skills(job_description)
-        
-        # 2. Recruiter Heuristics (Parallelizable)
-        heuristics_task = self.analyze_recruiter_heuristics(resume_text_full, file_metadata)
-        
-        extracted, heuristics = await asyncio.gather(extracted_task, heuristics_task)
-        
-        # 3. Verify Skills
-        hard_skills_verified = await self.verify_skills(extracted.get("hard_skills", []), collection)
-        soft_skills_verified = await self.verify_skills(extracted.get("soft_skills", []), collection)
-        
-        # 4. Generate Report
-        final_report = await self.generate_report(job_description, hard_skills_verified, soft_skills_verified, heuristics)
-        
-        return final_report
+            # A malformed stream shouldn't poison the cache
+            print(f"Error caching streamed report: {e}")
 
 if __name__ == "__main__":
     pass
@@ -1,10 +1,19 @@
 import streamlit as st
 import requests
 import json
+import hashlib
+import time
+from concurrent.futures import ThreadPoolExecutor
 
 # Configuration
 API_URL = "http://localhost:8000/analyze"
 
+# Module-level session so repeated analyze clicks reuse the same keep-alive
+# connection instead of paying TCP+TLS setup per request.
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+SESSION.mount("https://", requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=4))
+
 st.set_page_config(page_title="Resume Checker AI", layout="wide")
 
 st.title("🤖 Resume Checker AI")
@@ -22,51 +31,88 @@ with col1:
 
     analyze_btn = st.button("Analyze Resume", type="primary")
 
+def render_result(result):
+    # Display Score
+    score = result.get("match_score", 0)
+    st.metric(label="Match Score", value=f"{score}%")
+
+    # Display Analysis
+    analysis = result.get("analysis", {})
+
+    st.subheader("✅ Strong Matches")
+    for item in analysis.get("strong_matches", []):
+        with st.expander(f"**{item.get('skill', 'Unknown')}**"):
+            st.write(f"_{item.get('evidence', '')}_")
+
+    st.subheader("⚠️ Missing / Weak Skills")
+    for item in analysis.get("missing_skills", []):
+        st.write(f"- **{item.get('skill', 'Unknown')}**: {item.get('recommendation', '')}")
+
+    st.subheader("🎤 Interview Prep")
+    for question in result.get("interview_prep", []):
+        st.info(question)
+
 with col2:
     st.header("Results")
-    
+
     if analyze_btn:
         if not uploaded_file:
             st.error("Please upload a resume.")
         elif not job_description:
             st.error("Please provide a job description.")
         else:
-            with st.spinner("Analyzing... Extracting skills, verifying matches..."):
-                try:
-                    # Prepare the request
-                    files = {"file": (uploaded_file.name, uploaded_file.getvalue(), "application/pdf")}
-                    data = {"job_description": job_description}
-                    
-                    response = requests.post(API_URL, files=files, data=data)
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        
-                        # Display Score
-                        score = result.get("match_score", 0)
-                        st.metric(label="Match Score", value=f"{score}%")
-                        
-                        # Display Analysis
-                        analysis = result.get("analysis", {})
-                        
-                        st.subheader("✅ Strong Matches")
-                        for item in analysis.get("strong_matches", []):
-                            with st.expander(f"**{item.get('skill', 'Unknown')}**"):
-                                st.write(f"_{item.get('evidence', '')}_")
-                                
-                        st.subheader("⚠️ Missing / Weak Skills")
-                        for item in analysis.get("missing_skills", []):
-                            st.write(f"- **{item.get('skill', 'Unknown')}**: {item.get('recommendation', '')}")
-
-                        st.subheader("🎤 Interview Prep")
-                        for question in result.get("interview_prep", []):
-                            st.info(question)
-                            
-                    else:
-                        st.error(f"Error: {response.text}")
-                        
-                except Exception as e:
-                    st.error(f"Connection Error: {e}. Is the backend running?")
+            # Session-scoped cache: resubmitting the same resume + JD
+            # skips the HTTP call (and the backend pipeline) entirely.
+            # Hash the file in chunks so we never hold a full copy just for the key.
+            file_digest = hashlib.sha256()
+            uploaded_file.seek(0)
+            for block in iter(lambda: uploaded_file.read(65536), b""):
+                file_digest.update(block)
+            cache_key = (
+                file_digest.hexdigest()
+                + ":" +
+                hashlib.sha256(job_description.encode()).hexdigest()
+            )
+            cache = st.session_state.setdefault("analysis_cache", {})
+
+            if cache_key in cache:
+                st.session_state["last_result"] = cache[cache_key]
+            else:
+                # Submit the POST to a background thread so the script run
+                # isn't blocked for the whole multi-second LLM pipeline;
+                # we poll the future on quick reruns below.
+                executor = st.session_state.setdefault("executor", ThreadPoolExecutor(max_workers=1))
+                # Pass the file object itself so requests streams it
+                # instead of us materializing the bytes a second time.
+                uploaded_file.seek(0)
+                files = {"file": (uploaded_file.name, uploaded_file, "application/pdf")}
+                data = {"job_description": job_description}
+                future = executor.submit(SESSION.post, API_URL, files=files, data=data, timeout=(5, 120))
+                st.session_state["pending"] = (future, cache_key)
+                st.session_state.pop("last_result", None)
+
+    pending = st.session_state.get("pending")
+    if pending is not None:
+        future, cache_key = pending
+        if not future.done():
+            st.info("⏳ Analyzing... Extracting skills, verifying matches...")
+            time.sleep(0.5)
+            st.rerun()
+        else:
+            del st.session_state["pending"]
+            try:
+                response = future.result()
+                if response.status_code == 200:
+                    result = response.json()
+                    st.session_state.setdefault("analysis_cache", {})[cache_key] = result
+                    st.session_state["last_result"] = result
+                else:
+                    st.error(f"Error: {response.text}")
+            except Exception as e:
+                st.error(f"Connection Error: {e}. Is the backend running?")
+
+    if "last_result" in st.session_state:
+        render_result(st.session_state["last_result"])
 
 st.markdown("---")
-st.caption("Powered by Gemini 2.5 Flash & ChromaDB")
+st.caption("Powered by Gemini 2.5 Flash")
@@ -3,11 +3,18 @@ import sys
 import os
 import json
 import asyncio
+import hashlib
+import mmap
+import pickle
+import threading
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from string import Template
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                              QHBoxLayout, QPushButton, QTextEdit, QLabel, 
                              QFileDialog, QProgressBar, QMessageBox, QFrame, QScrollArea)
-from PyQt6.QtCore import Qt, QThread, pyqtSignal, QSize
-from PyQt6.QtGui import QFont, QColor, QPalette, QIcon
+from PyQt6.QtCore import Qt, QObject, QTimer, pyqtSignal, QSize
+from PyQt6.QtGui import QFont, QColor, QPalette, QIcon, QTextCursor, QTextDocument
 
 # Ensure we can import our modules
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -16,68 +23,433 @@ from pdf_processor import extract_text_from_pdf, clean_text, chunk_text
 from vector_store import VectorStore
 from analyzer import ResumeAnalyzer
 
-class AnalysisWorker(QThread):
+# The selector loop avoids Proactor quirks with async HTTP stacks on Windows;
+# set the policy once at import, not per analysis (and never on other OSes).
+if sys.platform == "win32":
+    asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+
+# Static CSS for the results report, hoisted to module scope so it isn't
+# re-formatted on every render. Score-dependent colors are appended per call.
+_RESULT_STYLE = """
+<style>
+    body { font-family: 'Segoe UI', sans-serif; color: #e2e8f0; }
+    .card {
+        background-color: #1e293b;
+        border: 1px solid #334155;
+        border-radius: 8px;
+        padding: 15px;
+        margin-bottom: 20px;
+    }
+    .score-container {
+        text-align: center;
+        padding: 20px;
+        background-color: #0f172a;
+        border-radius: 12px;
+        margin-bottom: 25px;
+        border: 1px solid #334155;
+    }
+    .score-circle {
+        font-size: 56px;
+        font-weight: bold;
+        margin: 0;
+    }
+    .score-label {
+        color: #94a3b8;
+        font-size: 14px;
+        text-transform: uppercase;
+        letter-spacing: 1px;
+    }
+    h3 {
+        color: #f8fafc;
+        font-size: 18px;
+        border-bottom: 2px solid #334155;
+        padding-bottom: 8px;
+        margin-top: 0;
+    }
+    ul, ol { padding-left: 20px; margin-top: 10px; }
+    li { margin-bottom: 8px; line-height: 1.6; }
+    .match-item { color: #cbd5e1; }
+    .match-skill { color: #4ade80; font-weight: bold; }
+    .miss-skill { color: #f87171; font-weight: bold; }
+    .warning { color: #f87171; }
+    .tip { color: #94a3b8; font-style: italic; }
+</style>
+"""
+
+# Report section shells, parsed once at import. display_results only joins
+# the per-item strings and substitutes them in, instead of re-parsing the
+# same f-string structure on every render.
+_SCORE_STYLE_TEMPLATE = Template(
+    "<style>h2 { color: $color; margin-top: 0; } .score-circle { color: $color; }</style>"
+)
+_SCORE_TEMPLATE = Template("""
+<div class="score-container">
+    <p class="score-label">Match Score</p>
+    <h1 class="score-circle">$score%</h1>
+</div>
+""")
+_SECTION_TEMPLATES = {
+    "red_flags": Template('<div class="card" style="border-left: 4px solid #f87171;">'
+                          '<h3>⚠️ Critical Red Flags</h3><ul>$items</ul></div>'),
+    "matches": Template('<div class="card" style="border-left: 4px solid #4ade80;">'
+                        '<h3>✅ Strong Matches</h3><ul>$items</ul></div>'),
+    "missing": Template('<div class="card" style="border-left: 4px solid #fbbf24;">'
+                        '<h3>❌ Missing Skills &amp; Gaps</h3><ul>$items</ul></div>'),
+    "style": Template('<div class="card"><h3>🎨 Style &amp; Formatting</h3><ul>$items</ul></div>'),
+    "interview": Template('<div class="card"><h3>🎤 Interview Prep</h3><ol>$items</ol></div>'),
+}
+
+# App-wide chrome, frozen at import. The stylesheet is applied once to the
+# QApplication (not per window), so constructing windows never re-parses it.
+_STYLESHEET = """
+    QMainWindow {
+        background-color: #0f172a;
+    }
+    QLabel {
+        font-family: 'Segoe UI', 'Inter', sans-serif;
+        font-size: 13px;
+        color: #cbd5e1;
+    }
+    QLabel#titleLabel {
+        font-size: 22px;
+        font-weight: 800;
+        color: #f8fafc;
+        margin-right: 8px;
+    }
+    QLabel#subtitleLabel {
+        font-size: 11px;
+        font-weight: 600;
+        color: #6366f1;
+        background-color: #1e1b4b;
+        border: 1px solid #312e81;
+        border-radius: 4px;
+        padding: 2px 6px;
+        margin-top: 6px;
+    }
+    QLabel#sectionTitle {
+        font-size: 14px;
+        font-weight: 600;
+        color: #94a3b8;
+        margin-top: 5px;
+        margin-bottom: 3px;
+    }
+    QLabel#subHeaderLabel {
+        font-size: 16px;
+        font-weight: 700;
+        color: #f8fafc;
+        margin-top: 5px;
+    }
+    QFrame#contentFrame {
+        background-color: #1e293b;
+        border-radius: 12px;
+        border: 1px solid #334155;
+    }
+    QFrame#sectionBox {
+        background-color: #0f172a;
+        border-radius: 8px;
+        border: 1px solid #334155;
+    }
+    QPushButton {
+        background-color: #334155;
+        color: #e2e8f0;
+        border: 1px solid #475569;
+        border-radius: 6px;
+        padding: 8px 12px;
+        font-weight: 600;
+        font-size: 13px;
+    }
+    QPushButton:hover {
+        background-color: #475569;
+        border-color: #64748b;
+    }
+    QPushButton#uploadBtn {
+        background-color: #1e293b;
+        text-align: left;
+        padding-left: 15px;
+    }
+    QPushButton#analyzeBtn {
+        background-color: #4f46e5;
+        border: none;
+        color: white;
+        font-size: 15px;
+        font-weight: bold;
+        border-radius: 8px;
+        margin-top: 10px;
+    }
+    QPushButton#analyzeBtn:hover {
+        background-color: #4338ca;
+    }
+    QPushButton#analyzeBtn:disabled {
+        background-color: #334155;
+        color: #94a3b8;
+    }
+    QTextEdit {
+        background-color: #0f172a;
+        color: #e2e8f0;
+        border: 1px solid #334155;
+        border-radius: 8px;
+        padding: 8px;
+        font-family: 'Consolas', 'Monaco', monospace;
+        font-size: 13px;
+        selection-background-color: #6366f1;
+        line-height: 1.4;
+    }
+    QTextEdit:focus {
+        border: 1px solid #6366f1;
+    }
+    QLabel#fileLabel {
+        color: #94a3b8;
+        font-style: italic;
+        margin-left: 15px;
+    }
+    QProgressBar {
+        background-color: #0f172a;
+        border: none;
+        border-radius: 6px;
+        height: 8px;
+        text-align: center;
+    }
+    QProgressBar::chunk {
+        background-color: #6366f1;
+        border-radius: 6px;
+    }
+    QScrollBar:vertical {
+        border: none;
+        background: #0f172a;
+        width: 12px;
+        margin: 0px;
+    }
+    QScrollBar::handle:vertical {
+        background: #334155;
+        min-height: 30px;
+        border-radius: 6px;
+    }
+    QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+        height: 0px;
+    }
+"""
+
+def _build_dark_palette() -> QPalette:
+    # Premium Dark Theme Palette
+    # Background: #0f172a (Slate 900)
+    # Surface: #1e293b (Slate 800)
+    # Accent: #6366f1 (Indigo 500)
+    # Text: #f8fafc (Slate 50)
+    dark_palette = QPalette()
+    bg_color = QColor(15, 23, 42)
+    surface_color = QColor(30, 41, 59)
+    text_color = QColor(248, 250, 252)
+    accent_color = QColor(99, 102, 241)
+
+    dark_palette.setColor(QPalette.ColorRole.Window, bg_color)
+    dark_palette.setColor(QPalette.ColorRole.WindowText, text_color)
+    dark_palette.setColor(QPalette.ColorRole.Base, surface_color)
+    dark_palette.setColor(QPalette.ColorRole.AlternateBase, bg_color)
+    dark_palette.setColor(QPalette.ColorRole.Text, text_color)
+    dark_palette.setColor(QPalette.ColorRole.Button, surface_color)
+    dark_palette.setColor(QPalette.ColorRole.ButtonText, text_color)
+    dark_palette.setColor(QPalette.ColorRole.Link, accent_color)
+    return dark_palette
+
+# On-disk resume cache: re-analyzing the same PDF (e.g. against several JDs)
+# skips text extraction, chunking, AND the embedding pass entirely.
+PDF_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "resume_checker", "pdf")
+
+def parse_pdf_file(path):
+    """
+    Top-level (hence picklable) parse entry point for the PDF worker
+    process: reads and extracts in the child, so only the resulting text
+    crosses the process boundary, not the PDF bytes.
+    """
+    with open(path, "rb") as f:
+        return extract_text_from_pdf(f)
+
+def load_pdf_cache(key):
+    try:
+        with open(os.path.join(PDF_CACHE_DIR, f"{key}.pkl"), "rb") as f:
+            payload = pickle.load(f)
+        if payload.get("embeddings") is not None:
+            # Widen the quantized vectors back to float32 lists for ingest
+            payload["embeddings"] = np.asarray(payload["embeddings"], dtype=np.float32).tolist()
+        return payload
+    except Exception:
+        return None
+
+def save_pdf_cache(key, payload):
+    try:
+        if payload.get("embeddings") is not None:
+            # Quantize to float16 on disk, same as the sqlite embedding
+            # cache: half the bytes, no measurable effect on cosine ranking.
+            payload = dict(payload, embeddings=np.asarray(payload["embeddings"], dtype=np.float16))
+        os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+        with open(os.path.join(PDF_CACHE_DIR, f"{key}.pkl"), "wb") as f:
+            pickle.dump(payload, f)
+    except Exception as e:
+        # Cache failures must never break the analysis itself
+        print(f"Warning: could not write resume cache: {e}")
+
+class AnalysisWorker(QObject):
     finished = pyqtSignal(dict)
     error = pyqtSignal(str)
+    # Incremental progress: emitted as soon as a pipeline stage resolves so
+    # the UI can show something long before the full report lands.
+    section_ready = pyqtSignal(str, object)
 
-    def __init__(self, pdf_path, job_description):
+    def __init__(self, vector_store, analyzer, loop, pdf_path, job_description, resume_memo, pdf_pool=None):
         super().__init__()
+        self.vector_store = vector_store
+        self.analyzer = analyzer
+        self.loop = loop
+        self.pdf_pool = pdf_pool
         self.pdf_path = pdf_path
         self.job_description = job_description
-
-    def run(self):
+        # Shared with MainWindow: maps (path, mtime, size) of the last
+        # analyzed resume to its ready-to-query collection and text.
+        self.resume_memo = resume_memo
+
+    def start(self):
+        # No per-click QThread anymore: the coroutine runs entirely on the
+        # app's long-lived loop thread, and the done callback fires there.
+        # Signal emission is queued back to the UI thread by Qt, so nothing
+        # here touches widgets off-thread.
+        future = asyncio.run_coroutine_threadsafe(self.perform_analysis(), self.loop)
+        future.add_done_callback(self._on_done)
+
+    def _on_done(self, future):
         try:
-            # Create a new event loop for this thread to handle async calls
-            # Windows ProactorEventLoop policy might be needed for some async ops, 
-            # but standard loop usually works for http calls.
-            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            result = loop.run_until_complete(self.perform_analysis())
-            self.finished.emit(result)
-            loop.close()
+            self.finished.emit(future.result())
         except Exception as e:
             self.error.emit(str(e))
 
     async def perform_analysis(self):
-        # 1. Read PDF
+        # This coroutine runs on the app's shared loop, so every blocking
+        # IO/CPU step below goes through asyncio.to_thread to keep other
+        # in-flight work (e.g. a previous analysis) progressing.
+
+        # 0. JD-only re-runs: if the selected file is byte-identical to the
+        # last analyzed one (same path, mtime and size), every resume-side
+        # artifact is still valid — skip straight to the JD/LLM stage
+        # without touching the file or the caches.
+        stat = await asyncio.to_thread(os.stat, self.pdf_path)
+        memo_key = (self.pdf_path, stat.st_mtime_ns, stat.st_size)
+        memo = self.resume_memo.get(memo_key)
+        if memo is not None:
+            self.section_ready.emit("parsed", {
+                "page_count": memo["file_metadata"]["page_count"],
+                "chunks": memo["n_chunks"],
+            })
+            return await self.analyzer.analyze(
+                self.job_description, memo["collection"], memo["raw_text"],
+                memo["file_metadata"], on_section=self.section_ready.emit,
+                chunk_embeddings=memo["chunk_embs"]
+            )
+
+        # 1. Map the PDF instead of reading it: mmap gives the hash and the
+        # parser a zero-copy view of the file, skipping one full-file read
+        # and allocation. Falls back to a plain read if mapping fails
+        # (empty file, exotic filesystem).
+        def open_pdf(path):
+            with open(path, 'rb') as f:
+                try:
+                    return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except (ValueError, OSError):
+                    f.seek(0)
+                    return f.read()
+
         try:
-            with open(self.pdf_path, 'rb') as f:
-                content = f.read()
+            content = await asyncio.to_thread(open_pdf, self.pdf_path)
         except Exception as e:
             raise Exception(f"Failed to read file: {e}")
-        
-        try:
-            raw_text, page_count = extract_text_from_pdf(content)
-        except Exception as e:
-            raise Exception(f"Failed to extract text from PDF: {e}")
 
-        cleaned_text = clean_text(raw_text)
-        chunks = chunk_text(cleaned_text)
+        # Content-addressed cache check: same PDF bytes -> same text, chunks
+        # and embeddings, no matter which JD it's analyzed against.
+        cache_key = await asyncio.to_thread(lambda: hashlib.sha256(content).hexdigest())
+        cached = await asyncio.to_thread(load_pdf_cache, cache_key)
+
+        if cached is not None:
+            raw_text = cached["raw_text"]
+            page_count = cached["page_count"]
+            chunks = cached["chunks"]
+            embeddings = cached.get("embeddings")
+        else:
+            try:
+                # Parse in the dedicated worker process when one is
+                # available: pypdf's text extraction is pure-Python CPU work
+                # that would otherwise hold the GIL against the embedding
+                # and UI threads. The child reads the file itself, so only
+                # the extracted text is pickled back.
+                if self.pdf_pool is not None:
+                    loop = asyncio.get_running_loop()
+                    raw_text, page_count = await loop.run_in_executor(
+                        self.pdf_pool, parse_pdf_file, self.pdf_path
+                    )
+                else:
+                    raw_text, page_count = await asyncio.to_thread(extract_text_from_pdf, content)
+            except Exception as e:
+                raise Exception(f"Failed to extract text from PDF: {e}")
+
+            cleaned_text = await asyncio.to_thread(clean_text, raw_text)
+            # chunk_text is lazy; materialize once for ingest and caching
+            chunks = await asyncio.to_thread(lambda: list(chunk_text(cleaned_text)))
+            embeddings = None
+
+        # The mapping is only needed for hashing and parsing; release it
+        # before the long-running embedding/LLM stages.
+        if isinstance(content, mmap.mmap):
+            content.close()
 
         if not chunks:
             raise Exception("Could not extract text from PDF (empty chunks).")
 
+        self.section_ready.emit("parsed", {"page_count": page_count, "chunks": len(chunks)})
+
         file_metadata = {
             "filename": os.path.basename(self.pdf_path),
             "page_count": page_count
         }
 
-        # 2. Vector Store
+        # 2. Vector Store (long-lived, shared across analyses). The resume's
+        # "collection" is an in-memory matrix over the chunks; the memo and
+        # the on-disk cache keep it alive across clicks, so there is no
+        # per-analysis index to build or tear down.
         try:
-            vs = VectorStore()
-            collection, collection_name = vs.create_collection_from_chunks(chunks)
+            vs = self.vector_store
+            if embeddings is None:
+                # Embed here (instead of inside the collection) so the
+                # vectors can be written through to the resume cache.
+                embeddings = await asyncio.to_thread(vs.embedding_fn, chunks)
+                await asyncio.to_thread(save_pdf_cache, cache_key, {
+                    "raw_text": raw_text,
+                    "page_count": page_count,
+                    "chunks": chunks,
+                    "embeddings": embeddings,
+                })
+            collection = await asyncio.to_thread(
+                vs.create_memory_collection, chunks, embeddings
+            )
         except Exception as e:
             raise Exception(f"Failed to initialize Vector Store: {e}")
 
-        try:
-            # 3. Analyze
-            analyzer = ResumeAnalyzer(vector_store=vs)
-            result = await analyzer.analyze(self.job_description, collection, raw_text, file_metadata)
-            return result
-        finally:
-            if 'vs' in locals() and 'collection_name' in locals():
-                vs.delete_collection(collection_name)
+        # Remember this resume's artifacts for the next JD-only re-run.
+        # Single entry: the GUI analyzes one resume at a time, and the memo
+        # is the only thing keeping a collection alive — clearing it here
+        # lets the previous resume's matrix be garbage collected.
+        self.resume_memo.clear()
+        self.resume_memo[memo_key] = {
+            "collection": collection,
+            "raw_text": raw_text,
+            "file_metadata": file_metadata,
+            "n_chunks": len(chunks),
+            "chunk_embs": embeddings,
+        }
+
+        # 3. Analyze (no teardown here: the collection is just numpy state
+        # held by the memo and dropped on the next analysis)
+        result = await self.analyzer.analyze(
+            self.job_description, collection, raw_text, file_metadata,
+            on_section=self.section_ready.emit, chunk_embeddings=embeddings
+        )
+        return result
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -87,10 +459,44 @@ class MainWindow(QMainWindow):
         self.resize(720, 502)
         self.center_window()
         self.pdf_path = None
-        
-        self.apply_styles()
+
+        # One store + analyzer for the whole session: API connection pools
+        # and the analyzer's caches (results, JD skills) are amortized
+        # across analyses instead of rebuilt per click.
+        self.vs = VectorStore()
+        self.analyzer = ResumeAnalyzer(vector_store=self.vs)
+        # Resume-side memo so a JD tweak doesn't re-run the PDF pipeline
+        self._resume_memo = {}
+
+        # One long-lived process for PDF parsing: the parse escapes the GIL
+        # entirely, and the fork/spawn cost is paid once, not per analysis.
+        try:
+            self._pdf_pool = ProcessPoolExecutor(max_workers=1)
+        except Exception as e:
+            print(f"Warning: PDF parse pool unavailable, parsing in-process. {e}")
+            self._pdf_pool = None
+
+        # One background asyncio loop for the whole session; workers submit
+        # coroutines to it via run_coroutine_threadsafe.
+        self._loop = asyncio.new_event_loop()
+        threading.Thread(target=self._loop.run_forever, daemon=True, name="analysis-loop").start()
+
+        # Prewarm once the window has painted, so the first analysis doesn't
+        # pay the embedding API's cold-start either.
+        QTimer.singleShot(0, self.warm_models)
+
         self.setup_ui()
 
+    def warm_models(self):
+        # Best-effort: a dummy embed warms the HTTP pool and the on-disk
+        # embedding cache off the UI thread. Failure (no key, offline) is fine.
+        def warm():
+            try:
+                self.vs.embed_texts(["warmup"])
+            except Exception:
+                pass
+        threading.Thread(target=warm, daemon=True, name="model-warmup").start()
+
     def center_window(self):
         qr = self.frameGeometry()
         cp = self.screen().availableGeometry().center()
@@ -184,158 +590,6 @@ class MainWindow(QMainWindow):
         self.results_area.setPlaceholderText("Analysis results will appear here...")
         main_layout.addWidget(self.results_area)
 
-    def apply_styles(self):
-        # Premium Dark Theme Palette
-        # Background: #0f172a (Slate 900)
-        # Surface: #1e293b (Slate 800)
-        # Accent: #6366f1 (Indigo 500)
-        # Text: #f8fafc (Slate 50)
-        
-        dark_palette = QPalette()
-        bg_color = QColor(15, 23, 42)
-        surface_color = QColor(30, 41, 59)
-        text_color = QColor(248, 250, 252)
-        accent_color = QColor(99, 102, 241)
-        
-        dark_palette.setColor(QPalette.ColorRole.Window, bg_color)
-        dark_palette.setColor(QPalette.ColorRole.WindowText, text_color)
-        dark_palette.setColor(QPalette.ColorRole.Base, surface_color)
-        dark_palette.setColor(QPalette.ColorRole.AlternateBase, bg_color)
-        dark_palette.setColor(QPalette.ColorRole.Text, text_color)
-        dark_palette.setColor(QPalette.ColorRole.Button, surface_color)
-        dark_palette.setColor(QPalette.ColorRole.ButtonText, text_color)
-        dark_palette.setColor(QPalette.ColorRole.Link, accent_color)
-        
-        QApplication.setPalette(dark_palette)
-
-        self.setStyleSheet("""
-            QMainWindow {
-                background-color: #0f172a;
-            }
-            QLabel {
-                font-family: 'Segoe UI', 'Inter', sans-serif;
-                font-size: 13px;
-                color: #cbd5e1;
-            }
-            QLabel#titleLabel {
-                font-size: 22px;
-                font-weight: 800;
-                color: #f8fafc;
-                margin-right: 8px;
-            }
-            QLabel#subtitleLabel {
-                font-size: 11px;
-                font-weight: 600;
-                color: #6366f1;
-                background-color: #1e1b4b;
-                border: 1px solid #312e81;
-                border-radius: 4px;
-                padding: 2px 6px;
-                margin-top: 6px;
-            }
-            QLabel#sectionTitle {
-                font-size: 14px;
-                font-weight: 600;
-                color: #94a3b8;
-                margin-top: 5px;
-                margin-bottom: 3px;
-            }
-            QLabel#subHeaderLabel {
-                font-size: 16px;
-                font-weight: 700;
-                color: #f8fafc;
-                margin-top: 5px;
-            }
-            QFrame#contentFrame {
-                background-color: #1e293b;
-                border-radius: 12px;
-                border: 1px solid #334155;
-            }
-            QFrame#sectionBox {
-                background-color: #0f172a;
-                border-radius: 8px;
-                border: 1px solid #334155;
-            }
-            QPushButton {
-                background-color: #334155;
-                color: #e2e8f0;
-                border: 1px solid #475569;
-                border-radius: 6px;
-                padding: 8px 12px;
-                font-weight: 600;
-                font-size: 13px;
-            }
-            QPushButton:hover {
-                background-color: #475569;
-                border-color: #64748b;
-            }
-            QPushButton#uploadBtn {
-                background-color: #1e293b;
-                text-align: left;
-                padding-left: 15px;
-            }
-            QPushButton#analyzeBtn {
-                background-color: #4f46e5;
-                border: none;
-                color: white;
-                font-size: 15px;
-                font-weight: bold;
-                border-radius: 8px;
-                margin-top: 10px;
-            }
-            QPushButton#analyzeBtn:hover {
-                background-color: #4338ca;
-            }
-            QPushButton#analyzeBtn:disabled {
-                background-color: #334155;
-                color: #94a3b8;
-            }
-            QTextEdit {
-                background-color: #0f172a;
-                color: #e2e8f0;
-                border: 1px solid #334155;
-                border-radius: 8px;
-                padding: 8px;
-                font-family: 'Consolas', 'Monaco', monospace; 
-                font-size: 13px;
-                selection-background-color: #6366f1;
-                line-height: 1.4;
-            }
-            QTextEdit:focus {
-                border: 1px solid #6366f1;
-            }
-            QLabel#fileLabel {
-                color: #94a3b8;
-                font-style: italic;
-                margin-left: 15px;
-            }
-            QProgressBar {
-                background-color: #0f172a;
-                border: none;
-                border-radius: 6px;
-                height: 8px;
-                text-align: center;
-            }
-            QProgressBar::chunk {
-                background-color: #6366f1;
-                border-radius: 6px;
-            }
-            QScrollBar:vertical {
-                border: none;
-                background: #0f172a;
-                width: 12px;
-                margin: 0px; 
-            }
-            QScrollBar::handle:vertical {
-                background: #334155;
-                min-height: 30px;
-                border-radius: 6px;
-            }
-            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
-                height: 0px;
-            }
-        """)
-
     def select_file(self):
         file_dialog = QFileDialog()
         file_path, _ = file_dialog.getOpenFileName(self, "Select Resume", "", "PDF Files (*.pdf)")
@@ -361,11 +615,34 @@ class MainWindow(QMainWindow):
         self.progress_bar.setVisible(True)
         self.results_area.setHtml("<div style='color: #94a3b8; text-align: center; margin-top: 40px; font-family: Segoe UI;'><h3>🤖 Analyzing Resume...</h3><p>Extracting text, verifying skills, and applying recruiter heuristics.</p></div>")
 
-        self.worker = AnalysisWorker(self.pdf_path, jd_text)
+        self.worker = AnalysisWorker(self.vs, self.analyzer, self._loop, self.pdf_path, jd_text, self._resume_memo, pdf_pool=self._pdf_pool)
         self.worker.finished.connect(self.display_results)
+        self.worker.section_ready.connect(self.display_section)
         self.worker.error.connect(self.handle_error)
         self.worker.start()
 
+    def display_section(self, key, payload):
+        """
+        Appends a progress fragment to the results area as pipeline stages
+        resolve, instead of leaving the user staring at a static spinner.
+        """
+        if key == "parsed":
+            frag = f"<p style='color: #94a3b8;'>📄 Parsed {payload['page_count']} page(s) into {payload['chunks']} chunks.</p>"
+        elif key == "verified_skills":
+            verified = payload.get("hard", []) + payload.get("soft", [])
+            found = sum(1 for s in verified if s.get("found"))
+            frag = f"<p style='color: #94a3b8;'>🔎 Found evidence for {found} of {len(verified)} required skills. Generating report...</p>"
+        else:
+            return
+
+        cursor = self.results_area.textCursor()
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        # Group the insert into one undo/edit block so Qt coalesces the
+        # relayout instead of re-flowing per inserted element.
+        cursor.beginEditBlock()
+        cursor.insertHtml(frag)
+        cursor.endEditBlock()
+
     def display_results(self, result):
         self.progress_bar.setVisible(False)
         self.analyze_btn.setEnabled(True)
@@ -382,110 +659,69 @@ class MainWindow(QMainWindow):
         
         # Color for Score
         score_color = "#4ade80" if match_score >= 80 else "#facc15" if match_score >= 50 else "#f87171"
-        
-        # Enhanced HTML Report
-        html = f"""
-        <style>
-            body {{ font-family: 'Segoe UI', sans-serif; color: #e2e8f0; }}
-            h2 {{ color: {score_color}; margin-top: 0; }}
-            .card {{ 
-                background-color: #1e293b; 
-                border: 1px solid #334155; 
-                border-radius: 8px; 
-                padding: 15px; 
-                margin-bottom: 20px; 
-            }}
-            .score-container {{
-                text-align: center;
-                padding: 20px;
-                background-color: #0f172a;
-                border-radius: 12px;
-                margin-bottom: 25px;
-                border: 1px solid #334155;
-            }}
-            .score-circle {{
-                font-size: 56px;
-                font-weight: bold;
-                color: {score_color};
-                margin: 0;
-            }}
-            .score-label {{
-                color: #94a3b8;
-                font-size: 14px;
-                text-transform: uppercase;
-                letter-spacing: 1px;
-            }}
-            h3 {{
-                color: #f8fafc;
-                font-size: 18px;
-                border-bottom: 2px solid #334155;
-                padding-bottom: 8px;
-                margin-top: 0;
-            }}
-            ul, ol {{ padding-left: 20px; margin-top: 10px; }}
-            li {{ margin-bottom: 8px; line-height: 1.6; }}
-            .match-item {{ color: #cbd5e1; }}
-            .match-skill {{ color: #4ade80; font-weight: bold; }}
-            .miss-skill {{ color: #f87171; font-weight: bold; }}
-            .warning {{ color: #f87171; }}
-            .tip {{ color: #94a3b8; font-style: italic; }}
-        </style>
-        
-        <div class="score-container">
-            <p class="score-label">Match Score</p>
-            <h1 class="score-circle">{match_score}%</h1>
-        </div>
-        """
-        
+
+        # Build the report as a list of fragments joined once at the end:
+        # repeated `html +=` copies the whole string each time (quadratic),
+        # append/join is linear in the total report size. The section shells
+        # are precompiled Templates; only the <li> items are built per call.
+        parts = [
+            _RESULT_STYLE,
+            _SCORE_STYLE_TEMPLATE.safe_substitute(color=score_color),
+            _SCORE_TEMPLATE.safe_substitute(score=match_score),
+        ]
+
         # Red Flags
         if red_flags:
-            html += """<div class="card" style="border-left: 4px solid #f87171;">
-                        <h3>⚠️ Critical Red Flags</h3><ul>"""
-            for flag in red_flags:
-                html += f"<li class='warning'>{flag}</li>"
-            html += "</ul></div>"
-            
+            items = "".join(f"<li class='warning'>{flag}</li>" for flag in red_flags)
+            parts.append(_SECTION_TEMPLATES["red_flags"].safe_substitute(items=items))
+
         # Matches
-        html += """<div class="card" style="border-left: 4px solid #4ade80;">
-                    <h3>✅ Strong Matches</h3><ul>"""
         if strong_matches:
+            match_items = []
             for match in strong_matches:
                 if isinstance(match, dict):
-                    html += f"<li class='match-item'><span class='match-skill'>{match.get('skill')}</span>: {match.get('evidence', '')}</li>"
+                    match_items.append(f"<li class='match-item'><span class='match-skill'>{match.get('skill')}</span>: {match.get('evidence', '')}</li>")
                 else:
-                    html += f"<li>{match}</li>"
+                    match_items.append(f"<li>{match}</li>")
+            items = "".join(match_items)
         else:
-            html += "<li>No strong matches found.</li>"
-        html += "</ul></div>"
-        
+            items = "<li>No strong matches found.</li>"
+        parts.append(_SECTION_TEMPLATES["matches"].safe_substitute(items=items))
+
         # Missing Skills
-        html += """<div class="card" style="border-left: 4px solid #fbbf24;">
-                    <h3>❌ Missing Skills & Gaps</h3><ul>"""
         if missing_skills:
+            gap_items = []
             for gap in missing_skills:
                 if isinstance(gap, dict):
-                    html += f"<li class='match-item'><span class='miss-skill'>{gap.get('skill')}</span>: {gap.get('recommendation', '')}</li>"
+                    gap_items.append(f"<li class='match-item'><span class='miss-skill'>{gap.get('skill')}</span>: {gap.get('recommendation', '')}</li>")
                 else:
-                    html += f"<li>{gap}</li>"
+                    gap_items.append(f"<li>{gap}</li>")
+            items = "".join(gap_items)
         else:
-            html += "<li>No major skills missing!</li>"
-        html += "</ul></div>"
+            items = "<li>No major skills missing!</li>"
+        parts.append(_SECTION_TEMPLATES["missing"].safe_substitute(items=items))
 
         # Style Critique
         if style_critique:
-             html += """<div class="card"><h3>🎨 Style & Formatting</h3><ul>"""
-             for critique in style_critique:
-                 html += f"<li>{critique}</li>"
-             html += "</ul></div>"
+            items = "".join(f"<li>{critique}</li>" for critique in style_critique)
+            parts.append(_SECTION_TEMPLATES["style"].safe_substitute(items=items))
 
         # Interview Prep
         if interview_prep:
-            html += """<div class="card"><h3>🎤 Interview Prep</h3><ol>"""
-            for q in interview_prep:
-                html += f"<li>{q}</li>"
-            html += "</ol></div>"
-
-        self.results_area.setHtml(html)
+            items = "".join(f"<li>{q}</li>" for q in interview_prep)
+            parts.append(_SECTION_TEMPLATES["interview"].safe_substitute(items=items))
+
+        # Lay out the report on a detached document, then swap it in with
+        # repaints suspended: setHtml on the live widget would re-layout
+        # (and repaint) the whole rich-text tree on the UI thread.
+        doc = QTextDocument()
+        doc.setDefaultFont(self.results_area.font())
+        doc.setHtml("".join(parts))
+        self.results_area.setUpdatesEnabled(False)
+        try:
+            self.results_area.setDocument(doc)
+        finally:
+            self.results_area.setUpdatesEnabled(True)
 
     def handle_error(self, error_msg):
         self.progress_bar.setVisible(False)
@@ -497,9 +733,12 @@ class MainWindow(QMainWindow):
 if __name__ == "__main__":
     app = QApplication(sys.argv)
     
-    # Set app style
+    # Set app style once, app-wide: windows inherit it instead of each
+    # rebuilding the palette and re-parsing the stylesheet.
     app.setStyle("Fusion")
-    
+    app.setPalette(_build_dark_palette())
+    app.setStyleSheet(_STYLESHEET)
+
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
@@ -1,8 +1,11 @@
-from fastapi import FastAPI, UploadFile, Form, HTTPException
+from contextlib import asynccontextmanager
+from functools import lru_cache
+from fastapi import Depends, FastAPI, Request, UploadFile, Form, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional, Dict, Any
+import asyncio
 import uvicorn
 import shutil
 import os
@@ -12,7 +15,15 @@ from vector_store import VectorStore
 from fastapi.middleware.cors import CORSMiddleware
 from analyzer import ResumeAnalyzer
 
-app = FastAPI(title="Resume Checker AI", version="2.0")
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One VectorStore for the process: the embedding function and the genai
+    # client's pooled connections are reused across requests. Only
+    # collections are per-request state.
+    app.state.vs = VectorStore()
+    yield
+
+app = FastAPI(title="Resume Checker AI", version="2.0", lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -22,6 +33,13 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+@lru_cache()
+def get_analyzer() -> ResumeAnalyzer:
+    # One analyzer for the process (built lazily on first request): its
+    # result/JD caches, rate-limit semaphore and cached-rubric state are
+    # shared across requests instead of rebuilt per call.
+    return ResumeAnalyzer(vector_store=app.state.vs)
+
 # Input Model (for documentation, though we use Form/File fields)
 class AnalysisResponse(BaseModel):
     match_score: int
@@ -29,48 +47,99 @@ class AnalysisResponse(BaseModel):
     recruiter_feedback: dict
     interview_prep: List[str]
 
+def _parse_and_chunk(pdf_file):
+    """
+    Sync parse/clean/chunk stage, kept together so the routes can push the
+    whole CPU-bound block onto a worker thread in one hop. Takes bytes or
+    a readable binary stream, same as extract_text_from_pdf.
+    """
+    # Modified: Now returns tuple
+    raw_text, page_count = extract_text_from_pdf(pdf_file)
+    cleaned_text = clean_text(raw_text)
+    # chunk_text is lazy; materialize once here for count checks and ingest
+    chunks = list(chunk_text(cleaned_text))
+    return raw_text, page_count, chunks
+
+async def process_upload(file: UploadFile):
+    """
+    Shared PDF handling for the buffered and streaming analyze routes.
+    Returns (raw_text, chunks, file_metadata).
+    """
+    # UploadFile already spools the body to a temp file past a size
+    # threshold; hand that file object straight to the parser instead of
+    # materializing a full bytes copy with file.read(). Parsing is seconds
+    # of pure CPU on big files, so it runs off the event loop either way.
+    raw_text, page_count, chunks = await asyncio.to_thread(_parse_and_chunk, file.file)
+
+    if not chunks:
+        raise HTTPException(status_code=400, detail="Could not extract text from PDF.")
+
+    # Prepare Metadata
+    file_metadata = {
+        "filename": file.filename,
+        "page_count": page_count
+    }
+    return raw_text, chunks, file_metadata
+
 @app.post("/analyze", response_model=AnalysisResponse)
 async def analyze_resume(
+    request: Request,
     file: UploadFile,
-    job_description: str = Form(...)
+    job_description: str = Form(...),
+    analyzer: ResumeAnalyzer = Depends(get_analyzer)
 ):
     try:
         # 1. Read and Process PDF
-        content = await file.read()
-        
-        # Modified: Now returns tuple
-        raw_text, page_count = extract_text_from_pdf(content)
-        
-        cleaned_text = clean_text(raw_text)
-        chunks = chunk_text(cleaned_text)
-        
-        if not chunks:
-            raise HTTPException(status_code=400, detail="Could not extract text from PDF.")
-
-        # Prepare Metadata
-        file_metadata = {
-            "filename": file.filename,
-            "page_count": page_count
-        }
-
-        # 2. Vector Store (Ephemeral)
-        # Initialize VectorStore
-        vs = VectorStore()
-        collection, collection_name = vs.create_collection_from_chunks(chunks)
-        
-        try:
-            # 3. Analyze
-            analyzer = ResumeAnalyzer(vector_store=vs)
-            
-            # Modified: Passing full text and metadata
-            result = await analyzer.analyze(job_description, collection, raw_text, file_metadata)
-            
-            return result
-            
-        finally:
-            # Cleanup
-            vs.delete_collection(collection_name)
-            
+        raw_text, chunks, file_metadata = await process_upload(file)
+
+        # 2. Vector Store (shared). The per-request "collection" is just a
+        # numpy matrix over the chunks — nothing to tear down afterwards.
+        # Building it embeds the chunks (a blocking HTTP round-trip), so it
+        # runs off the event loop like the parse stage.
+        vs = request.app.state.vs
+        collection = await asyncio.to_thread(vs.create_memory_collection, chunks)
+
+        # 3. Analyze (shared instance via dependency)
+        # Modified: Passing full text and metadata
+        result = await analyzer.analyze(job_description, collection, raw_text, file_metadata)
+
+        return result
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        # In production, log the full error
+        print(f"Error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.post("/analyze/stream")
+async def analyze_resume_stream(
+    request: Request,
+    file: UploadFile,
+    job_description: str = Form(...),
+    analyzer: ResumeAnalyzer = Depends(get_analyzer)
+):
+    """
+    Streaming twin of /analyze: the response body is the report JSON emitted
+    incrementally as the model generates it, so clients can start rendering
+    at first-token latency.
+    """
+    try:
+        raw_text, chunks, file_metadata = await process_upload(file)
+
+        vs = request.app.state.vs
+        # Off the event loop: building the collection embeds the chunks
+        # through a blocking HTTP call.
+        collection = await asyncio.to_thread(vs.create_memory_collection, chunks)
+
+        async def report_stream():
+            async for chunk in analyzer.analyze_stream(job_description, collection, raw_text, file_metadata):
+                yield chunk
+
+        return StreamingResponse(report_stream(), media_type="application/json")
+
+    except HTTPException:
+        raise
     except Exception as e:
         # In production, log the full error
         print(f"Error: {e}")
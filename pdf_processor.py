@@ -1,41 +1,176 @@
 import io
-from typing import List
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterator, List
 import pypdf
 
-def extract_text_from_pdf(file_content: bytes) -> str:
+# Optional native backend: pdfium extracts text several times faster than
+# pypdf's pure-Python tokenizer and releases the GIL while doing it. pypdf
+# stays as the fallback so the dependency remains optional.
+try:
+    import pypdfium2 as pdfium
+except ImportError:
+    pdfium = None
+
+# PDFium itself is not thread-safe and pypdfium2 does not serialize calls,
+# so all pdfium work is funneled through one lock. Concurrent uploads fall
+# back to queueing here rather than corrupting shared native state; the
+# pypdf path (one reader per worker thread) needs no such guard.
+_PDFIUM_LOCK = threading.Lock()
+
+# Page count at which per-page extraction moves onto a thread pool; the
+# pool and per-thread reader setup aren't worth it for short resumes.
+_PARALLEL_PAGE_MIN = 4
+
+# Pages whose text strips below this are separators/cover art: they carry
+# no signal but would still occupy chunk (and embedding) space.
+_MIN_PAGE_CHARS = 20
+
+# Chunks below this after stripping are layout debris (stray headers,
+# page numbers); each one would cost a full embedding slot.
+_MIN_CHUNK_CHARS = 50
+
+# Collapses a newline plus any surrounding blank space/lines into a single
+# newline, in one compiled-regex pass over the text.
+_WS_LINES = re.compile(r"[ \t]*\n[ \t\n]*")
+
+# Deletion table for str.translate: maps every non-ASCII code point to None,
+# so the filter runs in one C-level pass with no intermediate bytes object.
+_NON_ASCII = dict.fromkeys(range(128, 0x110000))
+
+def extract_text_from_pdf(file_content) -> str:
     """
-    Extracts raw text from a PDF file content.
+    Extracts raw text from a PDF, given either raw bytes or a readable
+    binary stream (BytesIO, mmap, an open file). Streams are handed to
+    the backend as-is, so callers can avoid materializing an extra bytes
+    copy. Uses the native pdfium backend when installed, pypdf otherwise.
     """
     try:
-        pdf_file = io.BytesIO(file_content)
-        reader = pypdf.PdfReader(pdf_file)
-        text = ""
-        page_count = len(reader.pages)
-        for page in reader.pages:
-            text += page.extract_text() + "\n"
-        return text, page_count
-
+        if pdfium is not None:
+            return _extract_with_pdfium(file_content)
+        return _extract_with_pypdf(file_content)
     except Exception as e:
         raise ValueError(f"Error reading PDF: {e}")
 
+def _extract_with_pdfium(file_content):
+    with _PDFIUM_LOCK:
+        pdf = pdfium.PdfDocument(file_content)
+        try:
+            page_count = len(pdf)
+            page_texts = []
+            for i in range(page_count):
+                page = pdf[i]
+                textpage = page.get_textpage()
+                page_texts.append(textpage.get_text_range())
+                textpage.close()
+                page.close()
+        finally:
+            pdf.close()
+    return _join_pages(page_texts), page_count
+
+def _extract_with_pypdf(file_content):
+    pdf_file = file_content if hasattr(file_content, "read") else io.BytesIO(file_content)
+    reader = pypdf.PdfReader(pdf_file)
+    page_count = len(reader.pages)
+
+    if page_count >= _PARALLEL_PAGE_MIN:
+        # Longer documents: extract pages concurrently. PdfReader isn't
+        # thread-safe (workers would race on stream seeks), so each
+        # worker thread opens its own reader over the same bytes.
+        if isinstance(file_content, (bytes, bytearray)):
+            data = file_content
+        else:
+            pdf_file.seek(0)
+            data = pdf_file.read()
+        page_texts = _extract_pages_parallel(data, page_count)
+    else:
+        page_texts = [page.extract_text() for page in reader.pages]
+
+    return _join_pages(page_texts), page_count
+
+def _join_pages(page_texts: List[str]) -> str:
+    """
+    Joins per-page text, dropping near-blank pages (cover sheets,
+    separators) whose only contribution downstream would be embedding
+    cost. The reported page_count stays the document's real page count.
+    """
+    kept = [text for text in page_texts if len(text.strip()) >= _MIN_PAGE_CHARS]
+    return "\n".join(kept) + "\n"
+
+def _extract_pages_parallel(data: bytes, page_count: int) -> List[str]:
+    """
+    Extracts all pages on a thread pool, one PdfReader per worker thread
+    (reused across that thread's pages). map preserves page order.
+    """
+    local = threading.local()
+
+    def extract(index: int) -> str:
+        reader = getattr(local, "reader", None)
+        if reader is None:
+            reader = pypdf.PdfReader(io.BytesIO(data))
+            local.reader = reader
+        return reader.pages[index].extract_text()
+
+    with ThreadPoolExecutor(max_workers=min(8, page_count)) as pool:
+        return list(pool.map(extract, range(page_count)))
+
 def clean_text(text: str) -> str:
     """
     Cleans the extracted text by removing excessive whitespace and non-ASCII characters.
     """
-    # Remove non-ASCII characters
-    text = text.encode("ascii", "ignore").decode()
-    # Replace multiple newlines with a single newline
-    text = "\n".join([line.strip() for line in text.split("\n") if line.strip()])
-    return text
+    # Remove non-ASCII characters. translate walks the string once and
+    # writes straight into the result, where encode/decode built a full
+    # bytes copy and then a str copy.
+    text = text.translate(_NON_ASCII)
+    # Collapse blank lines and per-line edge whitespace in a single regex
+    # pass: the old split/strip/filter/join walked the text three times and
+    # built two intermediate lists per call.
+    return _WS_LINES.sub("\n", text).strip()
+
+# Chunk break preferences, largest boundary first: paragraph, line,
+# sentence, then word. A raw mid-word cut is the last resort.
+_SEPARATORS = ("\n\n", "\n", ". ", " ")
 
-def chunk_text(text: str, chunk_size: int = 500) -> List[str]:
+def chunk_text(text: str, chunk_size: int = 500, overlap: int = 0) -> Iterator[str]:
     """
-    Splits the text into smaller chunks for embedding.
+    Lazily yields chunks of at most chunk_size characters, breaking on the
+    largest natural boundary (paragraph > line > sentence > word) inside
+    each window. Boundary-aware chunks keep whole statements together, so
+    retrieval sees coherent evidence and fewer, fuller chunks reach the
+    embedding API. An optional overlap repeats the tail of each chunk at
+    the head of the next.
     """
-    chunks = []
-    for i in range(0, len(text), chunk_size):
-        chunks.append(text[i : i + chunk_size])
-    return chunks
+    # An overlap approaching chunk_size would stall the window; cap it so
+    # every step is guaranteed to advance by at least half a chunk even on
+    # separator-free text.
+    overlap = max(0, min(overlap, chunk_size // 2))
+    n = len(text)
+    start = 0
+    while start < n:
+        end = start + chunk_size
+        if end >= n:
+            tail = text[start:]
+            if len(tail.strip()) >= _MIN_CHUNK_CHARS:
+                yield tail
+            return
+        # Break at the last preferred separator inside the window; fall
+        # back to a hard cut when the window has no separator at all.
+        # The search starts past the overlap zone: a cut inside it would
+        # put the next window's start at or before the current one, and
+        # rfind would then keep returning the same separator forever.
+        cut = end
+        for sep in _SEPARATORS:
+            pos = text.rfind(sep, start + overlap + 1, end)
+            if pos > start:
+                cut = pos + len(sep)
+                break
+        chunk = text[start:cut]
+        # Skip layout debris; a chunk this small can't evidence a skill
+        # but would still cost an embedding call.
+        if len(chunk.strip()) >= _MIN_CHUNK_CHARS:
+            yield chunk
+        start = max(start + 1, cut - overlap)
 
 if __name__ == "__main__":
     # Test with a dummy file if needed
@@ -0,0 +1,27 @@
+from pdf_processor import chunk_text
+
+def test_chunk_overlap_has_bounded_chunk_count():
+    # Regression: stepping back by `overlap` used to re-find the same
+    # separator, creeping one character per iteration and emitting a
+    # near-duplicate chunk each step (~150 chunks for this input).
+    text = ("Sentence number one here. " * 69).strip()
+    chunks = list(chunk_text(text, chunk_size=400, overlap=100))
+    assert len(chunks) <= len(text) // (400 - 100) + 1
+
+def test_chunk_overlap_covers_text_and_shares_boundaries():
+    text = ("Sentence number one here. " * 69).strip()
+    chunks = list(chunk_text(text, chunk_size=400, overlap=100))
+    # Every word survives chunking...
+    assert set(text.split()) <= set(" ".join(chunks).split())
+    # ...and each chunk really does repeat the tail of its predecessor.
+    for prev, nxt in zip(chunks, chunks[1:]):
+        assert nxt[:30] in prev
+
+def test_chunk_zero_overlap_reassembles_losslessly():
+    text = ("Sentence number one here. " * 69).strip()
+    assert "".join(chunk_text(text, chunk_size=400)) == text
+
+def test_chunk_overlap_advances_on_separator_free_text():
+    text = "x" * 3000
+    chunks = list(chunk_text(text, chunk_size=400, overlap=100))
+    assert len(chunks) <= 3000 // (400 - 100) + 1
@@ -1,8 +1,9 @@
 import os
-import chromadb
-from chromadb.utils import embedding_functions
-from typing import List, Dict
-import uuid
+import hashlib
+import sqlite3
+import threading
+import numpy as np
+from typing import List, Optional
 from google import genai
 from google.genai import types
 
@@ -14,60 +15,218 @@ except Exception as e:
     print(f"Warning: GOOGLE_API_KEY might be missing. {e}")
     client = None
 
-class GeminiEmbeddingFunction(chromadb.EmbeddingFunction):
+EMBEDDING_MODEL = "text-embedding-004"
+
+_CACHE_PATH = os.path.join(os.path.expanduser("~"), ".cache", "resume_checker", "embeddings.sqlite")
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by (model, sha256(text)).
+
+    The same skill strings ("Python", "AWS", "React") recur across JDs, so a
+    warm cache skips the paid embedding call entirely. Vectors are stored as
+    float16 bytes to halve the on-disk footprint; the precision loss is
+    irrelevant for cosine ranking at this dimension.
+    """
+    def __init__(self, path: str = _CACHE_PATH):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT, key TEXT, vector BLOB, PRIMARY KEY (model, key))"
+        )
+        self._lock = threading.Lock()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = hashlib.sha256(text.encode()).hexdigest()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT vector FROM embeddings WHERE model = ? AND key = ?",
+                (model, key),
+            ).fetchone()
+        if row is None:
+            return None
+        return np.frombuffer(row[0], dtype=np.float16).astype(np.float32).tolist()
+
+    def put_many(self, model: str, items: List[tuple]):
+        """
+        Writes (text, vector) pairs in one transaction. A cold resume can
+        miss on every chunk; one executemany + commit costs a single fsync
+        where per-vector puts paid one each.
+        """
+        rows = [
+            (
+                model,
+                hashlib.sha256(text.encode()).hexdigest(),
+                np.asarray(vector, dtype=np.float16).tobytes(),
+            )
+            for text, vector in items
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (model, key, vector) VALUES (?, ?, ?)",
+                rows,
+            )
+            self._conn.commit()
+
+# Shared across the process; a broken cache should never break analysis
+try:
+    _embedding_cache = EmbeddingCache()
+except Exception as e:
+    print(f"Warning: embedding cache unavailable. {e}")
+    _embedding_cache = None
+
+# Per-request content cap for embed_content batches; resumes rarely exceed
+# this, but a slice loop keeps very long documents within the API limit.
+EMBEDDING_BATCH_SIZE = 100
+
+def _embed_cached(texts: List[str]) -> List[List[float]]:
     """
-    Custom Embedding Function for ChromaDB using Google Gemini API.
+    Shared embedding path: serve each text from the persistent cache when
+    possible and batch-embed only the misses (in API-limit-sized slices),
+    writing them through for next time. Identical chunks across re-uploads
+    or overlapping JDs cost zero API calls.
     """
-    def __call__(self, input: chromadb.Documents) -> chromadb.Embeddings:
-        if not client:
-            raise ValueError("Gemini Client not initialized. Check GOOGLE_API_KEY.")
-        
-        # Gemini expects a list of strings
-        # We need to batch if the list is too large, but for resumes it's likely fine.
-        # Model: text-embedding-004 is a good default.
-        
-        embeddings = []
-        for text in input:
-            response = client.models.embed_content(
-                model="text-embedding-004",
-                contents=text,
+    if not client:
+        raise ValueError("Gemini Client not initialized. Check GOOGLE_API_KEY.")
+
+    vectors: List = [None] * len(texts)
+    miss_indices = []
+    for i, text in enumerate(texts):
+        cached = _embedding_cache.get(EMBEDDING_MODEL, text) if _embedding_cache else None
+        if cached is not None:
+            vectors[i] = cached
+        else:
+            miss_indices.append(i)
+
+    for start in range(0, len(miss_indices), EMBEDDING_BATCH_SIZE):
+        batch = miss_indices[start : start + EMBEDDING_BATCH_SIZE]
+        response = client.models.embed_content(
+            model=EMBEDDING_MODEL,
+            contents=[texts[i] for i in batch],
+        )
+        for i, emb in zip(batch, response.embeddings):
+            vectors[i] = emb.values
+        if _embedding_cache:
+            # One transaction per API slice instead of one per vector, and
+            # written slice-by-slice so a failure later in the loop doesn't
+            # discard embeddings already paid for.
+            _embedding_cache.put_many(
+                EMBEDDING_MODEL,
+                [(texts[i], vectors[i]) for i in batch],
             )
-            embeddings.append(response.embeddings[0].values)
-        return embeddings
+
+    return vectors
+
+class GeminiEmbeddingFunction:
+    """
+    Callable embedding function backed by the Gemini API via the shared
+    cache-aware batch path.
+    """
+    def __call__(self, input: List[str]) -> List[List[float]]:
+        return _embed_cached(list(input))
+
+def cosine_topk(matrix: np.ndarray, queries: np.ndarray, k: int):
+    """
+    Top-k cosine neighbours for each query row against a row-normalized
+    matrix. Fully vectorized: one matmul, one argpartition, and one sort
+    over the (Q, k) winners — no Python-level per-row loops. Returns
+    (indices, distances) with distances as cosine distance (1 - sim).
+    """
+    # Accumulate similarities in float32 even when the operands are stored
+    # half-precision: ranking stays stable, the bandwidth saving stays.
+    sims = (queries @ matrix.T).astype(np.float32)
+    k = min(k, matrix.shape[0])
+    if k < matrix.shape[0]:
+        # argpartition finds the k winners in O(N); only they get sorted
+        top = np.argpartition(sims, -k, axis=1)[:, -k:]
+    else:
+        top = np.broadcast_to(np.arange(matrix.shape[0]), sims.shape).copy()
+    top_sims = np.take_along_axis(sims, top, axis=1)
+    order = np.argsort(top_sims, axis=1)[:, ::-1]
+    top = np.take_along_axis(top, order, axis=1)
+    top_sims = np.take_along_axis(top_sims, order, axis=1)
+    return top, 1.0 - top_sims
+
+class InMemoryCollection:
+    """
+    Per-resume retrieval collection backed by a plain numpy matrix. For one
+    resume against one JD an ANN index buys nothing: the embeddings are
+    paid for either way, and a normalized (N, D) matrix times a query
+    vector IS the cosine search, with no add/delete bookkeeping per
+    request. Exposes the query()/count() surface the analyzer uses.
+    """
+    def __init__(self, store, chunks: List[str], embeddings):
+        self._store = store
+        self._chunks = list(chunks)
+        matrix = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        # Pre-normalized rows stored at half precision: query time is a
+        # pure dot product over half the bytes, and fp16 is already how
+        # the on-disk caches hold these vectors.
+        self._matrix = (matrix / norms).astype(np.float16)
+
+    def count(self) -> int:
+        return len(self._chunks)
+
+    def query(self, query_texts=None, query_embeddings=None, n_results: int = 1, include=None):
+        if query_embeddings is None:
+            query_embeddings = self._store.embed_texts(list(query_texts))
+        queries = np.asarray(query_embeddings, dtype=np.float32)
+        qnorms = np.linalg.norm(queries, axis=1, keepdims=True)
+        qnorms[qnorms == 0] = 1.0
+        top, dists = cosine_topk(self._matrix, (queries / qnorms).astype(np.float16), n_results)
+        documents = [[self._chunks[i] for i in row] for row in top]
+        return {"documents": documents, "distances": dists.tolist()}
 
 class VectorStore:
     def __init__(self):
-        # Use a persistent client or ephemeral? 
-        # Plan said Ephemeral for this specific use case (per request), 
-        # but we might want to keep the DB connection open.
-        # Check plan: "state management ... create Ephemeral Collection ... delete immediately"
-        # We will use an in-memory Client for true ephemerality or just manage collections carefully.
-        self.chroma_client = chromadb.EphemeralClient() 
         self.embedding_fn = GeminiEmbeddingFunction()
 
-    def create_collection_from_chunks(self, chunks: List[str]) -> chromadb.Collection:
-        collection_name = f"resume_{uuid.uuid4().hex}"
-        collection = self.chroma_client.create_collection(
-            name=collection_name,
-            embedding_function=self.embedding_fn
-        )
-        
-        ids = [f"id_{i}" for i in range(len(chunks))]
-        collection.add(
-            documents=chunks,
-            ids=ids
-        )
-        return collection, collection_name
+    def embed_chunks(self, chunks: List[str]) -> np.ndarray:
+        """
+        Batched, cache-aware embedding of a chunk list as an (N, D) float32
+        matrix, ready for the in-memory cosine path.
+        """
+        return np.asarray(self.embed_texts(list(chunks)), dtype=np.float32)
 
-    def query_similar(self, collection, query_text: str, n_results: int = 3) -> List[str]:
-        results = collection.query(
-            query_texts=[query_text],
-            n_results=n_results
-        )
-        return results["documents"][0] # Return list of matched chunks
+    def create_memory_collection(self, chunks: List[str], embeddings=None) -> InMemoryCollection:
+        """
+        Builds the numpy-backed collection used on the analyze hot path.
+        """
+        chunks = list(chunks)
+        if embeddings is None:
+            embeddings = self.embed_chunks(chunks)
+        return InMemoryCollection(self, chunks, embeddings)
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embeds a list of strings, serving repeats from the persistent cache
+        and batch-embedding only the misses.
+        """
+        return _embed_cached(list(texts))
 
-    def delete_collection(self, collection_name: str):
-        self.chroma_client.delete_collection(collection_name)
+    def query_similar_batch(self, collection, query_texts: List[str], n_results: int = 1, query_embeddings=None):
+        # One round-trip for all queries: the whole list is embedded together,
+        # so we pay a single embedding call instead of one per query. If the
+        # caller already embedded the queries, the vectors pass straight
+        # through and the embedding step is skipped entirely.
+        if query_embeddings is not None:
+            results = collection.query(
+                query_embeddings=query_embeddings,
+                n_results=n_results,
+                include=["documents", "distances"]
+            )
+        else:
+            results = collection.query(
+                query_texts=query_texts,
+                n_results=n_results,
+                include=["documents", "distances"]
+            )
+        # One list of matched chunks (and their cosine distances) per query,
+        # so callers can decide whether a nearest neighbour is actually close.
+        return results["documents"], results["distances"]
 
 if __name__ == "__main__":
     # Test